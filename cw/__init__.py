@@ -1,4 +1,4 @@
-from .cw import CellWorld, Cell, Agent, Item, ItemType, Direction, Status, CW_API_LOCK
+from .cw import CellWorld, Cell, Grid, Agent, Item, Inventory, ItemType, Direction, Status, CW_API_LOCK, OBSTACLE, PIT, TRAP
 from .cwviz import CellWorldVisualizer
 
 __version__ = "0.0.1"
@@ -0,0 +1,13 @@
+import logging
+
+try:
+    from numba import njit, prange
+    # cw configures the root logger at DEBUG, keep numba's compiler traces out of it
+    logging.getLogger('numba').setLevel(logging.WARNING)
+except ImportError:  # numba is optional, kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
@@ -1,26 +1,70 @@
 from enum import Enum
 from threading import RLock
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import logging
 from functools import wraps
+import itertools
+import operator
+import os
 import random
+import sys
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+import numpy as np
+
+from ._jit import njit
+
+logging.basicConfig(level=os.environ.get('CW_LOG_LEVEL', 'DEBUG').upper(), format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 CW_API_LOCK = RLock()
-_pocket = {'call_count': 0}
-
-def _api(method):
+# Terrain bits of CellWorld.flags
+OBSTACLE = 1
+PIT = 2
+TRAP = 4
+_BLOCKING = OBSTACLE | PIT
+_EMPTY_CELL_TEXT = "·   "
+
+def _glyph_lut(*order) -> List[str]:
+    """Map every OBSTACLE | PIT | TRAP combination to the glyph of its first set bit in `order`."""
+    return [next((glyph for bit, glyph in order if flags & bit), "") for flags in range(8)]
+
+_GLYPH = _glyph_lut((OBSTACLE, "O"), (PIT, "P"), (TRAP, "T"))
+# The bracketed grid has always shown pits above obstacles
+_GLYPH_PIT_FIRST = _glyph_lut((PIT, "P"), (OBSTACLE, "O"), (TRAP, "T"))
+_call_counter = itertools.count(1)
+
+def _traced(method):
     @wraps(method)
     def wrapper(*args, **kwargs):
-        with CW_API_LOCK:
-            _pocket['call_count'] += 1
-            logger.debug(f"{_pocket['call_count']:7} Calling {method.__name__} with args: {args[1:]}, kwargs: {kwargs}")
-            result = method(*args, **kwargs)
-            logger.debug(f"{_pocket['call_count']:7} {method.__name__} returned: {result}")
+        call_count = next(_call_counter)
+        logger.debug("%7d Calling %s with args: %s, kwargs: %s", call_count, method.__name__, args[1:], kwargs)
+        result = method(*args, **kwargs)
+        logger.debug("%7d %s returned: %s", call_count, method.__name__, result)
         return result
     return wrapper
 
+def _api(method):
+    """World-mutating call: serialised on CW_API_LOCK.
+
+    Call tracing is decided once at decoration time, so it costs nothing when DEBUG is off.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        method = _traced(method)
+
+    @wraps(method)
+    def locked(*args, **kwargs):
+        with CW_API_LOCK:
+            return method(*args, **kwargs)
+    return locked
+
+def _api_read(method):
+    """Read-only call: traced like _api but does not take CW_API_LOCK.
+
+    As with _api, tracing is only wrapped in if DEBUG is enabled at decoration time.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        return _traced(method)
+    return method
+
 class Direction(Enum):
     LOCAL = (0, 0)
     NORTH = (0, 1)
@@ -32,6 +76,17 @@ class Direction(Enum):
     SOUTHEAST = (1, -1)
     SOUTHWEST = (-1, -1)
 
+# Plain attributes avoid the enum `value` descriptor on hot paths;
+# `_ortho_id` is non-zero only for the four orthogonal directions
+for _d in Direction:
+    _d.dx, _d.dy = _d.value
+    _d._ortho_id = 0
+del _d
+Direction.EAST._ortho_id = 1
+Direction.WEST._ortho_id = 2
+Direction.NORTH._ortho_id = 3
+Direction.SOUTH._ortho_id = 4
+
 class ItemType(Enum):
     FOOD = "food"
     GOLD = "gold"
@@ -46,41 +101,121 @@ class Status(Enum):
 
 
 class Item:
+    __slots__ = ('type', 'name', 'value')
+    _pool: Dict[Tuple[ItemType, str, int], 'Item'] = {}
+
     def __init__(self, item_type: ItemType, name: str, value: int = 0):
         self.type = item_type
-        self.name = name
+        self.name = sys.intern(name)
         self.value = value
 
+    @classmethod
+    def get(cls, item_type: ItemType, name: str, value: int = 0) -> 'Item':
+        """Return a shared instance for identical item definitions (flyweight)."""
+        key = (item_type, name, value)
+        item = cls._pool.get(key)
+        if item is None:
+            item = cls._pool[key] = cls(item_type, name, value)
+        return item
+
     def __repr__(self):
         return f"{self.name} ({self.type.value})"
 
 
+class Inventory:
+    """Item list with a per-type index for O(1) lookups by ItemType."""
+    __slots__ = ('_all', '_by_type', 'best_weapon_value')
+
+    def __init__(self):
+        self._all: List[Item] = []
+        self._by_type: Dict[ItemType, List[Item]] = {item_type: [] for item_type in ItemType}
+        # Cached attack bonus, refreshed whenever a weapon enters or leaves
+        self.best_weapon_value = 0
+
+    def add(self, item: Item):
+        self._all.append(item)
+        self._by_type[item.type].append(item)
+        if item.type == ItemType.WEAPON and item.value > self.best_weapon_value:
+            self.best_weapon_value = item.value
+
+    # list-compatible alias
+    append = add
+
+    def __getitem__(self, index):
+        return self._all[index]
+
+    def remove(self, item: Item):
+        self._all.remove(item)
+        self._by_type[item.type].remove(item)
+        if item.type == ItemType.WEAPON:
+            self.best_weapon_value = max([0] + [w.value for w in self._by_type[ItemType.WEAPON]])
+
+    def clear(self):
+        self._all.clear()
+        for items in self._by_type.values():
+            items.clear()
+        self.best_weapon_value = 0
+
+    def first(self, item_type: ItemType) -> Optional[Item]:
+        """Return the earliest acquired item of the given type, if any."""
+        items = self._by_type[item_type]
+        return items[0] if items else None
+
+    def __iter__(self):
+        return iter(self._all)
+
+    def __len__(self):
+        return len(self._all)
+
+    def __repr__(self):
+        return repr(self._all)
+
+
 class Cell:
+    __slots__ = ('items', 'agents')
+
     def __init__(self):
-        self.obstacle: bool = False
-        self.trap: bool = False
-        self.pit: bool = False
         self.items: List[Item] = []
-        self.agents: List['Agent'] = []
-
-    @_api
-    def is_passable(self) -> bool:
-        return not self.obstacle and not self.pit
+        self.agents: Dict[str, 'Agent'] = {}
 
     def __repr__(self):
-        features = []
-        if self.obstacle: features.append("O")
-        if self.pit: features.append("P")
-        if self.trap: features.append("T")
-        return f"Cell({', '.join(features)}, items={len(self.items)}, agents={len(self.agents)})"
+        return f"Cell(items={len(self.items)}, agents={len(self.agents)})"
+
+
+class Grid:
+    """(x, y) indexed view over CellWorld's flat cell list."""
+    __slots__ = ('_cells', '_width', '_height')
+
+    def __init__(self, cells: List[Cell], height: int):
+        self._cells = cells
+        self._width = len(cells) // height
+        self._height = height
+
+    def __getitem__(self, xy) -> Cell:
+        if isinstance(xy, tuple):
+            x, y = xy
+            if not (0 <= x < self._width and 0 <= y < self._height):
+                raise IndexError(f"cell ({x}, {y}) is outside the {self._width}x{self._height} grid")
+            return self._cells[x * self._height + y]
+        # Legacy grid[x][y] access: grid[x] is the column x as a list of cells
+        try:
+            x = operator.index(xy)
+        except TypeError:
+            raise TypeError(f"grid indices must be grid[x, y] or grid[x], not {type(xy).__name__}") from None
+        if not 0 <= x < self._width:
+            raise IndexError(f"column {x} is outside the {self._width}x{self._height} grid")
+        return self._cells[x * self._height:(x + 1) * self._height]
 
 
 class Agent:
+    __slots__ = ('name', 'health', 'energy', 'inventory', 'atp', 'position',
+                 'goal', 'status', 'on_goal_set', 'goal_log')
+
     def __init__(self, name: str, health: int = 100, energy: int = 100, on_goal_set=None):
         self.name = name
         self.health = health
         self.energy = energy
-        self.inventory: List[Item] = []
+        self.inventory = Inventory()
         self.atp: int = 0
         self.position: Tuple[int, int] = (0, 0)
         self.goal = None
@@ -112,24 +247,56 @@ class Agent:
         self.goal = None
         self.status = Status.IDLE
 
-    @_api
     def can_act(self) -> bool:
         return self.atp > 0 and self.health > 0 and self.energy > 0
 
     def __repr__(self):
         return f"Agent({self.name}, ♥{self.health}, ⚡{self.energy}, ATP:{self.atp}, Status: {self.status})"
 
+# Direction and its (i, j) index in a 3x3 tile centred on the agent
+_NEIGHBOR_ORDER = tuple((d, (d.dx + 1, d.dy + 1)) for d in Direction)
+
 def _ensure_ortho_direction(direction: Direction):
-    if direction not in [Direction.EAST, Direction.NORTH, Direction.SOUTH, Direction.WEST]:
+    if not direction._ortho_id:
         raise ValueError(f'Not ortho-direction: {direction}')
 
+# _move_kernel results
+_MOVE_BLOCKED = 0
+_MOVE_OK = 1
+_MOVE_TRAPPED = 2
+
+@njit(cache=True)
+def _move_kernel(flags, x, y, dx, dy, width, height):
+    """Check a step onto (x + dx, y + dy) and spring a trap there, returns a _MOVE_* code"""
+    nx = x + dx
+    ny = y + dy
+    if nx < 0 or ny < 0 or nx >= width or ny >= height:
+        return _MOVE_BLOCKED
+    terrain = flags[nx, ny]
+    if terrain & _BLOCKING:
+        return _MOVE_BLOCKED
+    if terrain & TRAP:
+        flags[nx, ny] = terrain & (0xFF ^ TRAP)
+        return _MOVE_TRAPPED
+    return _MOVE_OK
+
 class CellWorld:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None):
         self.width = width
         self.height = height
-        self.grid = [[Cell() for _ in range(height)] for _ in range(width)]
+        # Terrain is packed into one byte per cell (OBSTACLE | PIT | TRAP), objects live in `_cells`.
+        # `flags` is the inner view of a zero border, so neighbourhood slices never clip.
+        self._flags_pad = np.zeros((width + 2, height + 2), dtype=np.uint8)
+        self.flags = self._flags_pad[1:-1, 1:-1]
+        # Flat cell storage in the same x-major order as `flags`: index x * height + y
+        self._cells = [Cell() for _ in range(width * height)]
+        self.grid = Grid(self._cells, height)
+        # Per-cell agent and item counts mirroring `_cells`, so readers can copy them in one go
+        self.occupancy = np.zeros((width, height), dtype=np.uint16)
+        self.item_counts = np.zeros((width, height), dtype=np.uint16)
         self.agents: Dict[str, Agent] = {}
         self.turn: int = 0
+        self._rng = random.Random(seed)
 
     @_api
     def new_turn(self, atp=100):
@@ -150,7 +317,8 @@ class CellWorld:
 
         self.agents[agent.name] = agent
         agent.position = position
-        self.grid[x][y].agents.append(agent)
+        self.grid[x, y].agents[agent.name] = agent
+        self.occupancy[x, y] += 1
         return True
 
     @_api
@@ -158,9 +326,10 @@ class CellWorld:
         if agent.name not in self.agents:
             return False
         x, y = agent.position
-        cell = self.grid[x][y]
-        cell.agents.remove(agent)
+        cell = self.grid[x, y]
+        del cell.agents[agent.name]
         del self.agents[agent.name]
+        self.occupancy[x, y] -= 1
         return True
 
     @_api
@@ -171,26 +340,23 @@ class CellWorld:
         if not self._validate_agent(agent) or not agent.can_act():
             return False
 
-        dx, dy = direction.value
+        dx, dy = direction.dx, direction.dy
         x, y = agent.position
-        new_x, new_y = x + dx, y + dy
-
-        if not self._is_valid_position(new_x, new_y):
-            return False
-
-        new_cell = self.grid[new_x][new_y]
-        if not new_cell.is_passable():
+        outcome = _move_kernel(self.flags, x, y, dx, dy, self.width, self.height)
+        if outcome == _MOVE_BLOCKED:
             return False
+        new_x, new_y = x + dx, y + dy
 
-        # Handle trap activation
-        if new_cell.trap:
+        # Handle trap activation, the kernel has already cleared the trap
+        if outcome == _MOVE_TRAPPED:
             agent.health -= 20
-            new_cell.trap = False
 
         # Consume ATP and move
         agent.atp -= 10
-        self.grid[x][y].agents.remove(agent)
-        new_cell.agents.append(agent)
+        del self.grid[x, y].agents[agent.name]
+        self.grid[new_x, new_y].agents[agent.name] = agent
+        self.occupancy[x, y] -= 1
+        self.occupancy[new_x, new_y] += 1
         agent.position = (new_x, new_y)
         # Handle target death
         if agent.health <= 0:
@@ -205,24 +371,24 @@ class CellWorld:
         if not self._validate_agent(attacker) or not attacker.can_act():
             return False
 
-        dx, dy = direction.value
+        dx, dy = direction.dx, direction.dy
         x, y = attacker.position
         target_x, target_y = x + dx, y + dy
 
-        if not self._is_valid_position(target_x, target_y):
+        if (target_x | target_y) < 0 or target_x >= self.width or target_y >= self.height:
             return False
 
-        target_cell = self.grid[target_x][target_y]
+        target_cell = self.grid[target_x, target_y]
         if not target_cell.agents:
             return False
 
         # Calculate damage
         base_damage = 10
-        weapon = next((i for i in attacker.inventory if i.type == ItemType.WEAPON), None)
-        damage = base_damage + (weapon.value if weapon else 0)
+        damage = base_damage + attacker.inventory.best_weapon_value
 
         # Apply damage
-        target = random.choice(target_cell.agents)
+        targets = tuple(target_cell.agents.values())
+        target = targets[self._rng.randrange(len(targets))]
         target.health -= damage
 
         # Handle target death
@@ -235,8 +401,9 @@ class CellWorld:
     def _handle_agent_death(self, agent: Agent):
         """Handle agent death and inventory drop"""
         x, y = agent.position
-        cell = self.grid[x][y]
+        cell = self.grid[x, y]
         cell.items.extend(agent.inventory)
+        self.item_counts[x, y] += len(agent.inventory)
         agent.inventory.clear()
         self.remove_agent(agent)
 
@@ -246,10 +413,12 @@ class CellWorld:
         if not self._validate_agent(agent) or not agent.can_act():
             return False
 
-        cell = self.grid[agent.position[0]][agent.position[1]]
+        x, y = agent.position
+        cell = self.grid[x, y]
         if 0 <= item_index < len(cell.items):
             item = cell.items.pop(item_index)
-            agent.inventory.append(item)
+            self.item_counts[x, y] -= 1
+            agent.inventory.add(item)
             agent.atp -= 5
             return True
         return False
@@ -260,7 +429,7 @@ class CellWorld:
         if not self._validate_agent(agent) or not agent.can_act():
             return False
 
-        food = next((i for i in agent.inventory if i.type == ItemType.FOOD), None)
+        food = agent.inventory.first(ItemType.FOOD)
         if food:
             agent.energy = min(100, agent.energy + food.value)
             agent.inventory.remove(food)
@@ -268,40 +437,50 @@ class CellWorld:
             return True
         return False
 
-    @_api
+    @_api_read
     def inspect_vicinity(self, agent: Agent) -> Dict[Direction, Dict[str, Any]]:
         """Return information about adjacent cells"""
         result = {}
         x, y = agent.position
+        # The padded layer always has a full 3x3 tile; off-map cells read as 0
+        tile = self._flags_pad[x:x + 3, y:y + 3]
+        obstacle = (tile & OBSTACLE).tolist()
+        pit = (tile & PIT).tolist()
+        trap = (tile & TRAP).tolist()
+
+        for direction, (i, j) in _NEIGHBOR_ORDER:
+            nx, ny = x + direction.dx, y + direction.dy
+            agents = items = ()
+            if self._is_valid_position(nx, ny):
+                cell = self.grid[nx, ny]
+                agents, items = cell.agents, cell.items
+
+            if not (agents or items or obstacle[i][j] or pit[i][j] or trap[i][j]):
+                # Empty and off-map neighbours skip the list building, each still gets its own dict
+                result[direction] = {"agents": (), "items": (), "terrain": ()}
+                continue
 
-        for direction in Direction:
-            dx, dy = direction.value
-            nx, ny = x + dx, y + dy
             cell_info = {
-                "agents": [],
-                "items": [],
+                "agents": list(agents),
+                "items": [item.name for item in items],
                 "terrain": []
             }
-
-            if self._is_valid_position(nx, ny):
-                cell = self.grid[nx][ny]
-                cell_info["agents"] = [a.name for a in cell.agents]
-                cell_info["items"] = [item.name for item in cell.items]
-                if cell.obstacle: cell_info["terrain"].append("obstacle")
-                if cell.pit: cell_info["terrain"].append("pit")
-                if cell.trap: cell_info["terrain"].append("trap")
+            if obstacle[i][j]: cell_info["terrain"].append("obstacle")
+            if pit[i][j]: cell_info["terrain"].append("pit")
+            if trap[i][j]: cell_info["terrain"].append("trap")
 
             result[direction] = cell_info
 
         return result
 
-    @_api
+    @_api_read
     def inspect_agent(self, agent):
         """Return detailed information about an agent"""
-        if agent.name not in self.agents:
+        # Single lookup: this runs without CW_API_LOCK, the agent may be removed concurrently
+        target_agent = self.agents.get(agent.name)
+        if target_agent is None:
             return {"error": "Agent does not exist"}
 
-        target_agent = self.agents[agent.name]
         return {
             "name": target_agent.name,
             "position": target_agent.position,
@@ -317,50 +496,56 @@ class CellWorld:
     def add_item(self, x: int, y: int, item: Item) -> bool:
         if not self._is_valid_position(x, y):
             return False
-        self.grid[x][y].items.append(item)
+        self.grid[x, y].items.append(item)
+        self.item_counts[x, y] += 1
         return True
 
     @_api
     def add_obstacle(self, x: int, y: int) -> bool:
         if not self._is_valid_position(x, y):
             return False
-        self.grid[x][y].obstacle = True
+        self.flags[x, y] |= OBSTACLE
         return True
 
     @_api
     def add_trap(self, x: int, y: int) -> bool:
         if not self._is_valid_position(x, y):
             return False
-        self.grid[x][y].trap = True
+        self.flags[x, y] |= TRAP
         return True
 
     @_api
     def add_pit(self, x: int, y: int) -> bool:
         if not self._is_valid_position(x, y):
             return False
-        self.grid[x][y].pit = True
+        self.flags[x, y] |= PIT
         return True
 
+    def is_passable(self, x: int, y: int) -> bool:
+        # Off-map cells are never passable; negative indices would otherwise wrap around
+        return self._is_valid_position(x, y) and bool((self.flags[x, y] & _BLOCKING) == 0)
+
     # Validation helpers
     def _validate_agent(self, agent: Agent) -> bool:
         return agent is not None and self.agents.get(agent.name) is agent
 
     def _is_valid_position(self, x: int, y: int) -> bool:
-        return 0 <= x < self.width and 0 <= y < self.height
+        # x | y is negative iff either coordinate is
+        return (x | y) >= 0 and x < self.width and y < self.height
 
     # Visualization
 
     @_api
     def print_world_state(self):
         """Prints a compact visualization of the world state"""
-        print(f"\n=== WORLD STATE (Turn {self.turn}) ===")
+        # Output is accumulated and written once
+        buf = [f"\n=== WORLD STATE (Turn {self.turn}) ===\n"]
 
         # Print grid with coordinates
-        print("\nGrid Layout:")
-        for y in reversed(range(len(self.grid[0]))):  # Print north at top
+        buf.append("\nGrid Layout:\n")
+        for y in reversed(range(self.height)):  # Print north at top
             row = []
-            for x in range(len(self.grid)):
-                cell = self.grid[x][y]
+            for cell, flags in zip(self._cells[y::self.height], self.flags[:, y].tolist()):
                 components = []
 
                 # Agents take priority
@@ -368,12 +553,9 @@ class CellWorld:
                     components.append(f"A{len(cell.agents)}")
 
                 # Terrain features
-                if cell.obstacle:
-                    components.append("O")
-                elif cell.pit:
-                    components.append("P")
-                elif cell.trap:
-                    components.append("T")
+                glyph = _GLYPH[flags & 7]
+                if glyph:
+                    components.append(glyph)
 
                 # Item count
                 if cell.items:
@@ -381,26 +563,28 @@ class CellWorld:
 
                 # Empty cell representation
                 if not components:
-                    components.append("·")
-
-                row.append("".join(components[:2]))  # Show up to 2 elements
-            print(" ".join(f"{cell:4}" for cell in row))
+                    row.append(_EMPTY_CELL_TEXT)
+                else:
+                    row.append("".join(components[:2]).ljust(4))  # Show up to 2 elements
+            buf.append(" ".join(row))
+            buf.append("\n")
 
         # Print legend
-        print("\nLegend:")
-        print("A# - Agents (count)  O - Obstacle  P - Pit")
-        print("T - Trap  I# - Items (count)  · - Empty")
+        buf.append("\nLegend:\n"
+                   "A# - Agents (count)  O - Obstacle  P - Pit\n"
+                   "T - Trap  I# - Items (count)  · - Empty\n")
 
         # Print agent statuses
-        print("\nActive Agents:")
+        buf.append("\nActive Agents:\n")
         for agent in self.agents.values():
             status = "ACTIVE" if agent.can_act() else "INACTIVE"
-            print(f"  {agent} ({status}) @ {agent.position}")
+            buf.append(f"  {agent} ({status}) @ {agent.position}\n")
             # print(f"{agent.name} ({status}) @ {agent.position}:")
             # print(f"  Health: {agent.health}  Energy: {agent.energy}  ATP: {agent.atp}")
             # print(f"  Inventory: {[item.name for item in agent.inventory]}")
-            print(f"   Inventory: {agent.inventory}")
+            buf.append(f"   Inventory: {agent.inventory}\n")
             # print("-" * 40)
+        sys.stdout.write("".join(buf))
 
     @_api
     def print_world_state2(self):
@@ -423,8 +607,7 @@ class CellWorld:
         grid_str = "     " + "    ".join(str(x) for x in range(self.width)) + "\n"
         for y in reversed(range(self.height)):
             row = [f"{y:2} "]
-            for x in range(self.width):
-                cell = self.grid[x][y]
+            for cell, flags in zip(self._cells[y::self.height], self.flags[:, y].tolist()):
                 elements = []
 
                 # Agents
@@ -432,12 +615,9 @@ class CellWorld:
                     elements.append(f"A{len(cell.agents)}")
 
                 # Terrain
-                if cell.pit:
-                    elements.append("P")
-                elif cell.obstacle:
-                    elements.append("O")
-                elif cell.trap:
-                    elements.append("T")
+                glyph = _GLYPH_PIT_FIRST[flags & 7]
+                if glyph:
+                    elements.append(glyph)
 
                 # Items
                 if cell.items:
@@ -456,8 +636,8 @@ if __name__ == "__main__":
     world.add_obstacle(2, 2)
     world.add_trap(1, 1)
     world.add_pit(3, 3)
-    world.add_item(0, 0, Item(ItemType.WEAPON, "Sword", 5))
-    world.add_item(1, 0, Item(ItemType.FOOD, "Apple", 20))
+    world.add_item(0, 0, Item.get(ItemType.WEAPON, "Sword", 5))
+    world.add_item(1, 0, Item.get(ItemType.FOOD, "Apple", 20))
 
     # Create agents
     alice = Agent("Alice")
@@ -1,29 +1,97 @@
 import os
+import warnings
+from collections import deque
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pygame
 import pygame_gui
 from pygame.locals import *
 
 from cw import CellWorld, Agent, Item, ItemType, Status
+from cw._jit import njit, prange
 import cw
 
+# Terrain shown for every OBSTACLE | PIT | TRAP combination, obstacles win over pits over traps
+_TERRAIN_NAME = [next((name for bit, name in ((cw.OBSTACLE, 'obstacle'), (cw.PIT, 'pit'), (cw.TRAP, 'trap'))
+                       if flags & bit), None) for flags in range(8)]
+
+# Font.render(wraplength=...) only exists in pygame-ce
+_FONT_WRAPS = getattr(pygame, 'IS_CE', False)
+
+# Smallest cell pitch _paint_terrain can lay out: grid border, interior and gap
+_MIN_CELL_SIZE = 3
+
+# Chat log bounds: lines kept, characters per line
+_LOG_MAX_LINES = 200
+_LOG_MAX_LINE_LEN = 300
+
+# Frame rate caps while the window is focused, in the background, or minimized/hidden
+_FPS_FOCUSED = 60
+_FPS_UNFOCUSED = 10
+_FPS_MINIMIZED = 2
+
+# Rendered tooltip and log lines kept around for reuse
+_TEXT_CACHE_SIZE = 512
+
+
+@njit(cache=True, parallel=True)
+def _paint_terrain(flags, color_lut, background, grid, out, cs):
+    """Paint every cell's terrain and grid lines into `out`, a (W*cs, H*cs, 3) surfarray buffer"""
+    # Each cell pitch is a 1px grid border around the cell colour plus a 1px gap to the next
+    # cell. Lay down background and all grid lines as whole strided rows/columns first ...
+    out[:, :] = background
+    out[0::cs, :] = grid
+    out[cs - 2::cs, :] = grid
+    out[:, 0::cs] = grid
+    out[:, cs - 2::cs] = grid
+    out[cs - 1::cs, :] = background
+    out[:, cs - 1::cs] = background
+
+    # ... then fill only the cells with terrain, colour looked up by their terrain bits
+    width, height = flags.shape
+    for x in prange(width):
+        for y in range(height):
+            terrain = flags[x, y] & 7
+            if terrain:
+                px = x * cs
+                py = (height - 1 - y) * cs
+                out[px + 1:px + cs - 2, py + 1:py + cs - 2] = color_lut[terrain]
+
 
 class CellWorldVisualizer:
-    def __init__(self, world: CellWorld, cell_size=40, hud_width=300, chat_height=150):
+    def __init__(self, world: CellWorld, cell_size=40, hud_width=300, chat_height=150, render_scale=1):
+        if not isinstance(render_scale, int) or isinstance(render_scale, bool) or render_scale < 1:
+            raise ValueError(f"render_scale must be an int >= 1, got {render_scale!r}")
+        # A cell needs its 1px border, 1px gap and some interior; the 18px tooltip/log font must not vanish
+        if cell_size // render_scale < _MIN_CELL_SIZE:
+            raise ValueError(f"render_scale {render_scale} leaves cell_size {cell_size} at "
+                             f"{cell_size // render_scale}px, at least {_MIN_CELL_SIZE}px are needed")
+        if 18 // render_scale < 1:
+            raise ValueError(f"render_scale {render_scale} shrinks the 18px text font to nothing")
         self.world = world
+        # render_scale > 1 lays the window out at 1/render_scale size and lets pygame.SCALED
+        # upscale it, so every fill and blit moves render_scale**2 fewer pixels
+        self.render_scale = render_scale
+        cell_size //= render_scale
+        hud_width //= render_scale
+        chat_height //= render_scale
         self.cell_size = cell_size
         self.hud_width = hud_width
         self.chat_height = chat_height
         self.selected_agent = None
 
         # Pygame initialization
+        if not getattr(pygame, 'IS_CE', False):
+            warnings.warn("Legacy pygame detected, install pygame-ce for faster rendering")
         pygame.init()
         self.width = world.width * cell_size + hud_width
         self.height = world.height * cell_size + chat_height
         # Add Retina display support (insert these 2 lines)
         pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK,
                                         pygame.GL_CONTEXT_PROFILE_CORE)
-        self.screen = pygame.display.set_mode((self.width, self.height), vsync=1)
+        self.screen = pygame.display.set_mode((self.width, self.height), vsync=1,
+                                              flags=pygame.SCALED if render_scale > 1 else 0)
         # if 'SDL_VIDEO_CENTERED' in pygame.display.get_driver():
         os.environ['SDL_VIDEO_CENTERED'] = '1'
         pygame.display.set_caption("Cell World Simulation")
@@ -31,6 +99,9 @@ class CellWorldVisualizer:
         # UI Manager setup
         self.manager = pygame_gui.UIManager((self.width, self.height))
         self.clock = pygame.time.Clock()
+        self._focused = True
+        self._minimized = False
+        self._target_fps = _FPS_FOCUSED
 
         # Create UI elements
         self._create_ui_elements()
@@ -48,34 +119,83 @@ class CellWorldVisualizer:
             'selection': (255, 255, 0)
         }
 
+        # Dirty-rect rendering: only changed screen areas are pushed to the display
+        self._dirty_rects: List[pygame.Rect] = []
+        # Last drawn state per cell, flat like CellWorld._cells: index x * height + y
+        self._prev_cell_state: List[Optional[tuple]] = [None] * (world.width * world.height)
+        self._prev_tooltip_rect: Optional[pygame.Rect] = None
+        self._prev_hud_key = None
+        self._last_stats_key = ()
+        self._hud_pending = False
+        self._full_redraw = True
+
+        # Chat log messages, newest first; only the lines that fit the panel get rendered, when it is redrawn
+        self._log_lines = deque(maxlen=_LOG_MAX_LINES)
+        self._log_dirty = True
+
+        # Tooltip/log font is loaded once, rendered lines ('Cell: 5,5', 'agent: A', ...) are reused
+        self._tooltip_font = pygame.font.Font(None, 18 // render_scale)
+        self._line_height = 20 // render_scale
+        self._text_cache: Dict[Tuple[str, int], pygame.Surface] = {}
+        self._tooltip_key = None
+        self._tooltip_surface: Optional[pygame.Surface] = None
+
+        # Cell geometry never changes, build the per-cell rects once: full pitch,
+        # and drawn area (pitch minus the 1px gap), indexed x * height + y
+        cs, h = cell_size, world.height
+        self._cell_pitches = [pygame.Rect(x * cs, (h - 1 - y) * cs, cs, cs)
+                              for x in range(world.width) for y in range(h)]
+        self._cell_rects = [pygame.Rect(r.x, r.y, cs - 1, cs - 1) for r in self._cell_pitches]
+
+        # Item and agent markers look the same in every cell, draw them once and blit
+        self._item_sprite = self._make_marker(self.colors['item'], cs // 6)
+        self._agent_sprite = self._make_marker(self.colors['agent'], cs // 4)
+
+        # Static terrain (cell colors and grid lines) is prerendered once and blitted
+        self._grid_surface = pygame.Surface((world.width * cell_size, world.height * cell_size)).convert()
+        self._pixel_buf = np.zeros((world.width * cell_size, world.height * cell_size, 3), dtype=np.uint8)
+        self._terrain_color_lut = np.array([self.colors[name or 'background'] for name in _TERRAIN_NAME],
+                                           dtype=np.uint8)
+        self._background_color = np.array(self.colors['background'], dtype=np.uint8)
+        self._grid_color = np.array(self.colors['grid'], dtype=np.uint8)
+        self._painted_flags = None
+        self._rebuild_grid_surface(world.flags.copy())
+
+        # World state copied under CW_API_LOCK once per frame, drawing then runs unlocked
+        self._snap_flags = None
+        self._snap_item_counts = None
+        self._snap_occupancy = None
+        # Agents by position, only occupied cells are present; used for selection hit-testing
+        self._agent_cell_map: Dict[Tuple[int, int], List[Agent]] = {}
+        self._snap_selected = None
+        self._snap_hovered = None
+
     def _create_ui_elements(self):
         grid_height = self.world.height * self.cell_size
+        s = self.render_scale
 
         # Stats panel (right side - unchanged)
         self.stats_panel = pygame_gui.elements.UITextBox(
             relative_rect=pygame.Rect(
-                (self.world.width * self.cell_size + 10, 10),
-                (self.hud_width - 20, grid_height - 20)
+                (self.world.width * self.cell_size + 10 // s, 10 // s),
+                (self.hud_width - 20 // s, grid_height - 20 // s)
             ),
             manager=self.manager,
             html_text="<b>Selected Agent:</b> None"
         )
 
-        # Chat log (full width bottom)
-        self.log_window = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(
-                (10, grid_height + 10),  # Start from left edge
-                (self.width - 20, self.chat_height - 50)  # Use full width
-            ),
-            manager=self.manager,
-            html_text=""
+        # Chat log (full width bottom), plain blitted lines instead of a pygame_gui text box
+        self._log_rect = pygame.Rect(
+            (10 // s, grid_height + 10 // s),  # Start from left edge
+            (self.width - 20 // s, self.chat_height - 50 // s)  # Use full width
         )
+        self._log_surface = pygame.Surface(self._log_rect.size).convert()
 
         # Input box (full width bottom)
         self.input_box = pygame_gui.elements.UITextEntryLine(
             relative_rect=pygame.Rect(
-                (10, grid_height + self.chat_height - 40),
-                (self.width - 100, 40)  # Stretch to right edge
+                (10 // s, grid_height + self.chat_height - 40 // s),
+                (self.width - 100 // s, 40 // s)  # Stretch to right edge
             ),
             manager=self.manager
         )
@@ -83,53 +203,131 @@ class CellWorldVisualizer:
         # Submit button (right-aligned in bottom panel)
         self.submit_button = pygame_gui.elements.UIButton(
             relative_rect=pygame.Rect(
-                (self.width - 90, grid_height + self.chat_height - 40),
-                (80, 40)
+                (self.width - 90 // s, grid_height + self.chat_height - 40 // s),
+                (80 // s, 40 // s)
             ),
             text='Submit',
             manager=self.manager
         )
 
+    def _make_marker(self, color, radius):
+        """A transparent cell-sized sprite with a filled circle at the cell centre"""
+        size = self.cell_size - 1
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(sprite, color, (size // 2, size // 2), radius)
+        return sprite
+
+    def _rebuild_grid_surface(self, flags):
+        self._painted_flags = flags
+        _paint_terrain(flags, self._terrain_color_lut, self._background_color, self._grid_color,
+                       self._pixel_buf, self.cell_size)
+        pygame.surfarray.blit_array(self._grid_surface, self._pixel_buf)
+
+    def _snapshot_world(self, mouse_pos):
+        """Copy everything a frame draws from the world, holding CW_API_LOCK only for the copy"""
+        world = self.world
+        cells = world._cells
+        with cw.CW_API_LOCK:
+            self._snap_flags = world.flags.copy()
+            self._snap_item_counts = world.item_counts.copy()
+            self._snap_occupancy = world.occupancy.copy()
+            # Positions come from the agents, each cell's list from cell.agents so that it keeps
+            # the order agents entered the cell in
+            agent_cell_map = {}
+            for agent in world.agents.values():
+                x, y = agent.position
+                if (x, y) not in agent_cell_map:
+                    agent_cell_map[x, y] = list(cells[x * world.height + y].agents.values())
+
+            agent = self.selected_agent
+            self._snap_selected = agent and (agent.name, agent.health, agent.energy, agent.atp, agent.status,
+                                             agent.goal, agent.position, tuple(agent.inventory))
+
+            hovered = self._hovered_cell(mouse_pos)
+            if hovered:
+                cell = cells[hovered[0] * world.height + hovered[1]]
+                hovered += (tuple(item.name for item in cell.items),
+                            tuple(agent.name for agent in cell.agents.values()))
+            self._snap_hovered = hovered
+        self._agent_cell_map = agent_cell_map
+
+    def _hovered_cell(self, mouse_pos):
+        """Grid coordinates under the mouse, or None outside the grid"""
+        if mouse_pos[1] > self.world.height * self.cell_size or mouse_pos[0] > self.world.width * self.cell_size:
+            return None
+        x = mouse_pos[0] // self.cell_size
+        y = self.world.height - 1 - (mouse_pos[1] // self.cell_size)
+        if 0 <= x < self.world.width and 0 <= y < self.world.height:
+            return x, y
+        return None
+
     def _draw_grid(self):
-        for x in range(self.world.width):
-            for y in range(self.world.height):
-                rect = pygame.Rect(
-                    x * self.cell_size,
-                    (self.world.height - 1 - y) * self.cell_size,
-                    self.cell_size - 1,
-                    self.cell_size - 1
-                )
-
-                cell = self.world.grid[x][y]
-
-                # Base cell color
-                if cell.obstacle:
-                    color = self.colors['obstacle']
-                elif cell.pit:
-                    color = self.colors['pit']
-                elif cell.trap:
-                    color = self.colors['trap']
-                else:
-                    color = self.colors['background']
-
-                pygame.draw.rect(self.screen, color, rect)
-
-                # Add grid lines (1px border)
-                pygame.draw.rect(self.screen, self.colors['grid'], rect, 1)
-
-                # Draw items
-                if cell.items:
-                    pygame.draw.circle(self.screen, self.colors['item'],
-                                       rect.center, self.cell_size // 6)
-
-                # Draw agents
-                for agent in cell.agents:
-                    pygame.draw.circle(self.screen, self.colors['agent'],
-                                       rect.center, self.cell_size // 4)
-
-                # Draw selection
-                if self.selected_agent and self.selected_agent.position == (x, y):
-                    pygame.draw.rect(self.screen, self.colors['selection'], rect, 3)
+        """Redraw the cells whose contents changed since the previous frame"""
+        # Terrain rarely changes (new obstacles, sprung traps), find it with one array compare
+        # and repaint the whole cached terrain in one compiled pass
+        changed = self._snap_flags != self._painted_flags
+        if changed.any():
+            self._rebuild_grid_surface(self._snap_flags)
+            for i in changed.ravel().nonzero()[0].tolist():
+                self._prev_cell_state[i] = None
+
+        # Hoisted out of the W*H loop below, which runs every frame
+        prev_state = self._prev_cell_state
+        pitches = self._cell_pitches
+        grid_surface = self._grid_surface
+        selected_idx = -1
+        if self._snap_selected:
+            x, y = self._snap_selected[6]
+            selected_idx = x * self.world.height + y
+
+        # Collect the changed cells' layers and issue each as one batched blit below
+        terrain_blits = []
+        item_blits = []
+        agent_blits = []
+        selected_rect = None
+        # The snapshot arrays are C-ordered (width, height), so their ravel matches the x * height + y cell index
+        for i, (flags, item_count, agents) in enumerate(zip(self._snap_flags.ravel().tolist(),
+                                                            self._snap_item_counts.ravel().tolist(),
+                                                            self._snap_occupancy.ravel().tolist())):
+            state = (flags, item_count, agents, i == selected_idx)
+            if prev_state[i] == state:
+                continue
+            prev_state[i] = state
+            # Restore the whole cell pitch, including the 1px gap, from the terrain cache
+            pitch = pitches[i]
+            terrain_blits.append((grid_surface, pitch, pitch))
+            if item_count:
+                item_blits.append((self._item_sprite, pitch))
+            if agents:
+                agent_blits.append((self._agent_sprite, pitch))
+            if i == selected_idx:
+                selected_rect = self._cell_rects[i]
+
+        if not terrain_blits:
+            return
+        screen = self.screen
+        screen.blits(terrain_blits, doreturn=False)
+        self._dirty_rects.extend(pitch for _, pitch, _ in terrain_blits)
+        blit_batch = getattr(screen, 'fblits', screen.blits)  # fblits is pygame-ce only
+        if item_blits:
+            blit_batch(item_blits)
+        if agent_blits:
+            blit_batch(agent_blits)
+        if selected_rect:
+            pygame.draw.rect(screen, self.colors['selection'], selected_rect, 3)
+
+    def _erase_tooltip(self):
+        """Clear last frame's tooltip and schedule the cells under it for redraw"""
+        rect = self._prev_tooltip_rect
+        if rect is None:
+            return
+        self._prev_tooltip_rect = None
+        self.screen.fill(self.colors['background'], rect)
+        self._dirty_rects.append(rect)
+        cs, h = self.cell_size, self.world.height
+        for col in range(max(rect.left // cs, 0), min((rect.right - 1) // cs + 1, self.world.width)):
+            for row in range(max(rect.top // cs, 0), min((rect.bottom - 1) // cs + 1, h)):
+                self._prev_cell_state[col * h + h - 1 - row] = None
 
     def _draw_hud(self):
         # Stats panel background
@@ -139,86 +337,114 @@ class CellWorldVisualizer:
         )
         pygame.draw.rect(self.screen, (30, 30, 30), stats_rect)
 
-        # Update stats panel text
-        if self.selected_agent:
+        # Push the panel to the display only when its content may have changed
+        # pygame_gui lays out new text on the update after set_text, so the frame after a
+        # set_text has to be pushed as well
+        hud_key = self._snap_selected
+        if hud_key != self._prev_hud_key or self._hud_pending or stats_rect.collidepoint(pygame.mouse.get_pos()):
+            self._prev_hud_key = hud_key
+            self._hud_pending = False
+            self._dirty_rects.append(stats_rect)
+
+        # Update stats panel text, set_text re-lays out the whole HTML so only when it changed
+        # (the agent's position is not shown)
+        stats_key = hud_key and hud_key[:6] + hud_key[7:]
+        if stats_key == self._last_stats_key:
+            return
+        self._last_stats_key = stats_key
+        self._hud_pending = True
+        if hud_key:
+            name, health, energy, atp, status, goal, _, inventory = hud_key
             stats_text = [
-                f"<b>Agent:</b> {self.selected_agent.name}",
-                f"Health: {self.selected_agent.health}",
-                f"Energy: {self.selected_agent.energy}",
-                f"ATP: {self.selected_agent.atp}",
-                f"Status: {self.selected_agent.status}",
-                f"Goal: {self.selected_agent.goal}",
+                f"<b>Agent:</b> {name}",
+                f"Health: {health}",
+                f"Energy: {energy}",
+                f"ATP: {atp}",
+                f"Status: {status}",
+                f"Goal: {goal}",
                 "<b>Inventory:</b>"
             ]
-            stats_text += [f"- {item.name} ({item.type.value})" for item in self.selected_agent.inventory]
+            stats_text += [f"- {item.name} ({item.type.value})" for item in inventory]
             self.stats_panel.set_text("<br>".join(stats_text))
         else:
             self.stats_panel.set_text("<b>Selected Agent:</b> None")
 
     def _draw_cell_info(self, mouse_pos):
-        # Only show tooltip in grid area
-        grid_width = self.world.width * self.cell_size
-        grid_bottom = self.world.height * self.cell_size
-        if mouse_pos[1] > grid_bottom or mouse_pos[0] > grid_width:
-            return
-
-        x = mouse_pos[0] // self.cell_size
-        y = self.world.height - 1 - (mouse_pos[1] // self.cell_size)
-
-        if 0 <= x < self.world.width and 0 <= y < self.world.height:
-            cell = self.world.grid[x][y]
-
-            terrain = None
-            if cell.obstacle:
-                terrain = 'obstacle'
-            elif cell.pit:
-                terrain = 'pit'
-            elif cell.trap:
-                terrain = 'trap'
-
-            terrain = f' [{terrain}]' if terrain else ''
-            info = [f"Cell: {x},{y}{terrain}"]
-
-            for item in cell.items:
-                info.append(f'item: {item.name}')
-
-            for agent in cell.agents:
-                info.append(f'agent: {agent.name}')
-
-            if info:
-                font = pygame.font.Font(None, 18)
-                line_height = 20
-                max_line_length = max(len(line) for line in info)
-                total_height = len(info) * line_height
-                tooltip_width = max(150, max_line_length * 8)  # Approximate text width
-
-                # Calculate initial position
-                x_pos = mouse_pos[0] + 10
-                y_pos = mouse_pos[1] + 10
-
-                # Adjust horizontal position
-                if x_pos + tooltip_width > grid_width:
-                    x_pos = max(10, mouse_pos[0] - tooltip_width - 10)
-
-                # Adjust vertical position
-                if y_pos + total_height > grid_bottom:
-                    y_pos = max(10, mouse_pos[1] - total_height - 10)
-
-                # Draw tooltip background
-                tooltip_rect = pygame.Rect(
-                    x_pos - 5,
-                    y_pos - 5,
-                    tooltip_width + 10,
-                    total_height + 10
-                )
-                pygame.draw.rect(self.screen, (40, 40, 40), tooltip_rect)
-                pygame.draw.rect(self.screen, (80, 80, 80), tooltip_rect, 1)
-
-                # Draw text
-                for line in info:
-                    text = font.render(line, True, (255, 255, 255))
-                    self.screen.blit(text, (x_pos, y_pos))
-                    y_pos += line_height
+        # Only show tooltip in grid area, the snapshot has no hovered cell elsewhere
+        hovered = self._snap_hovered
+        if hovered:
+            grid_width = self.world.width * self.cell_size
+            grid_bottom = self.world.height * self.cell_size
+            x, y = hovered[:2]
+            flags = self._snap_flags[x, y]
+
+            # Rebuild the tooltip only when the hovered cell or its contents changed,
+            # plain mouse moves just blit the cached surface at the new position
+            key = hovered + (flags,)
+            if key != self._tooltip_key:
+                self._tooltip_key = key
+                self._tooltip_surface = self._render_tooltip(*key)
+            tooltip = self._tooltip_surface
+            tooltip_width, total_height = tooltip.get_width() - 10, tooltip.get_height() - 10
+
+            # Calculate initial position
+            x_pos = mouse_pos[0] + 10
+            y_pos = mouse_pos[1] + 10
+
+            # Adjust horizontal position
+            if x_pos + tooltip_width > grid_width:
+                x_pos = max(10, mouse_pos[0] - tooltip_width - 10)
+
+            # Adjust vertical position
+            if y_pos + total_height > grid_bottom:
+                y_pos = max(10, mouse_pos[1] - total_height - 10)
+
+            tooltip_rect = self.screen.blit(tooltip, (x_pos - 5, y_pos - 5))
+            self._prev_tooltip_rect = tooltip_rect
+            self._dirty_rects.append(tooltip_rect)
+
+    def _render_tooltip(self, x, y, item_names, agent_names, flags):
+        terrain = _TERRAIN_NAME[flags & 7]
+        terrain = f' [{terrain}]' if terrain else ''
+        info = [f"Cell: {x},{y}{terrain}"]
+
+        for name in item_names:
+            info.append(f'item: {name}')
+
+        for name in agent_names:
+            info.append(f'agent: {name}')
+
+        line_height = self._line_height
+        max_line_length = max(len(line) for line in info)
+        total_height = len(info) * line_height
+        tooltip_width = max(150, max_line_length * 8) // self.render_scale  # Approximate text width
+
+        # Tooltip background with a 5px margin around the text
+        tooltip = pygame.Surface((tooltip_width + 10, total_height + 10)).convert()
+        tooltip.fill((40, 40, 40))
+        pygame.draw.rect(tooltip, (80, 80, 80), tooltip.get_rect(), 1)
+
+        # Draw text
+        y_pos = 5
+        for line in info:
+            tooltip.blit(self._render_text_line(line), (5, y_pos))
+            y_pos += line_height
+        return tooltip
+
+    def _render_text_line(self, line, wraplength=0):
+        """Render `line` once and reuse it, wrapped to `wraplength` pixels when that is non-zero
+        (legacy pygame cannot wrap, there long lines are clipped)"""
+        key = (line, wraplength)
+        text = self._text_cache.get(key)
+        if text is None:
+            if len(self._text_cache) >= _TEXT_CACHE_SIZE:
+                self._text_cache.clear()
+            if wraplength and _FONT_WRAPS:
+                text = self._tooltip_font.render(line, True, (255, 255, 255), wraplength=wraplength)
+            else:
+                text = self._tooltip_font.render(line, True, (255, 255, 255))
+            text = self._text_cache[key] = text.convert_alpha()
+        return text
 
     def run(self):
         # Enable retina scaling factor (add in run() before main loop)
@@ -229,60 +455,115 @@ class CellWorldVisualizer:
                 vsync=1, flags=pygame.SCALED)
         running = True
         while running:
-            time_delta = self.clock.tick(60) / 1000.0
-            mouse_pos = pygame.mouse.get_pos()
-
-            for event in pygame.event.get():
-                if event.type == QUIT:
-                    running = False
-
-                if event.type == MOUSEBUTTONDOWN:
-                    # Only select agents in grid area
-                    if mouse_pos[0] < self.world.width * self.cell_size and \
-                            mouse_pos[1] < self.world.height * self.cell_size:
-                        x = mouse_pos[0] // self.cell_size
-                        y = self.world.height - 1 - (mouse_pos[1] // self.cell_size)
-                        cell = self.world.grid[x][y]
-                        if cell.agents:
-                            self.selected_agent = cell.agents[0]
-
-                if event.type == pygame_gui.UI_BUTTON_PRESSED:
-                    if event.ui_element == self.submit_button:
-                        goal = self.input_box.get_text()
-                        if goal:
-                            if self.selected_agent:
-                                if self.selected_agent.status == Status.EXEC_GOAL:
-                                    self._add_log(f"CWV: Selected agent {self.selected_agent.name} is busy.")
-                                else:
-                                    self._add_log(f"User to {self.selected_agent.name}: {goal}")
-                                    self.selected_agent.set_goal(goal)
-                                    self.input_box.set_text("")
+            time_delta = self.clock.tick(self._target_fps) / 1000.0
+            # Input first, then state, then drawing, so a frame always shows the latest input
+            running = self._process_events()
+            self._update(time_delta)
+            self._render(pygame.mouse.get_pos())
+
+    def _process_events(self):
+        """Handle all pending events, returns False once the window was closed"""
+        running = True
+        mouse_pos = pygame.mouse.get_pos()
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                running = False
+
+            if event.type == MOUSEBUTTONDOWN:
+                # Only select agents in grid area, hit-tested against last frame's agent positions
+                agents = self._agent_cell_map.get(self._hovered_cell(mouse_pos))
+                if agents:
+                    self.selected_agent = agents[0]
+
+            if event.type == pygame_gui.UI_BUTTON_PRESSED:
+                if event.ui_element == self.submit_button:
+                    goal = self.input_box.get_text()
+                    if goal:
+                        if self.selected_agent:
+                            if self.selected_agent.status == Status.EXEC_GOAL:
+                                self._add_log(f"CWV: Selected agent {self.selected_agent.name} is busy.")
                             else:
-                                self._add_log(f"CWV: No agent selected. Please select an agent.")
-
-                self.manager.process_events(event)
-
-            for agent_name, agent in self.world.agents.items():
-                new_messages = agent.take_goal_log()
-                if new_messages:
-                    for message in new_messages:
-                        self._add_log(f"{agent_name}: {message}")
-
+                                self._add_log(f"User to {self.selected_agent.name}: {goal}")
+                                self.selected_agent.set_goal(goal)
+                                self.input_box.set_text("")
+                        else:
+                            self._add_log(f"CWV: No agent selected. Please select an agent.")
+
+            if event.type in (VIDEOEXPOSE, WINDOWEXPOSED, WINDOWRESIZED):
+                self._full_redraw = True
+
+            # Nobody is watching a background or minimized window closely, slow the loop down
+            if event.type in (WINDOWFOCUSGAINED, WINDOWFOCUSLOST):
+                self._focused = event.type == WINDOWFOCUSGAINED
+            elif event.type in (WINDOWMINIMIZED, WINDOWHIDDEN):
+                self._minimized = True
+            elif event.type in (WINDOWRESTORED, WINDOWSHOWN, WINDOWMAXIMIZED):
+                self._minimized = False
+            self._target_fps = (_FPS_MINIMIZED if self._minimized
+                                else _FPS_FOCUSED if self._focused else _FPS_UNFOCUSED)
+
+            self.manager.process_events(event)
+        return running
+
+    def _update(self, time_delta):
+        for agent_name, agent in self.world.agents.items():
+            new_messages = agent.take_goal_log()
+            if new_messages:
+                for message in new_messages:
+                    self._add_log(f"{agent_name}: {message}")
+
+        self.manager.update(time_delta)
+
+    def _render(self, mouse_pos):
+        if self._full_redraw:
             self.screen.fill(self.colors['background'])
-
-            with cw.CW_API_LOCK:
-                self._draw_grid()
-                self._draw_hud()
-                self._draw_cell_info(mouse_pos)
-
-            self.manager.update(time_delta)
-            self.manager.draw_ui(self.screen)
+            self._prev_cell_state = [None] * len(self._prev_cell_state)
+            self._prev_tooltip_rect = None
+            self._prev_hud_key = None
+
+        self._snapshot_world(mouse_pos)
+        self._erase_tooltip()
+        self._draw_grid()
+        self._draw_hud()
+        self._draw_cell_info(mouse_pos)
+
+        # pygame_gui repaints the chat panel every frame (cursor, hover, log)
+        chat_rect = pygame.Rect(0, self.world.height * self.cell_size, self.width, self.chat_height)
+        self.screen.fill(self.colors['background'], chat_rect)
+        self._draw_log()
+
+        self.manager.draw_ui(self.screen)
+        if self._full_redraw:
             pygame.display.flip()
+            self._full_redraw = False
+        else:
+            self._dirty_rects.append(chat_rect)
+            pygame.display.update(self._dirty_rects)
+        self._dirty_rects.clear()
 
     def _add_log(self, message: str):
-        current_text = self.log_window.html_text
-        new_text = f"{message}<br>{current_text}"
-        self.log_window.set_text(new_text)
+        if len(message) > _LOG_MAX_LINE_LEN:
+            message = message[:_LOG_MAX_LINE_LEN - 3] + '...'
+        self._log_lines.appendleft(message)
+        self._log_dirty = True
+
+    def _draw_log(self):
+        """Blit the chat log, repainting its surface only after new lines arrived"""
+        if self._log_dirty:
+            self._log_dirty = False
+            surface = self._log_surface
+            surface.fill((30, 30, 30))
+            y_pos = 5
+            wraplength = self._log_rect.width - 10
+            # Wrapped messages take several text lines, keep the usual gap after the last one
+            spacing = self._line_height - self._tooltip_font.get_linesize()
+            for line in self._log_lines:
+                if y_pos >= surface.get_height():
+                    break
+                text = self._render_text_line(line, wraplength)
+                surface.blit(text, (5, y_pos))
+                y_pos += text.get_height() + spacing
+        self.screen.blit(self._log_surface, self._log_rect)
 
 
 # Example usage
@@ -292,9 +573,9 @@ if __name__ == "__main__":
     # Add world content
     world.add_obstacle(5, 5)
     world.add_trap(3, 3)
-    world.add_item(2, 2, Item(ItemType.FOOD, "Apple", 20))
-    world.add_item(4, 4, Item(ItemType.WEAPON, "Sword", 5))
-    world.add_item(3, 4, Item(ItemType.RESOURCE, "Stone", 10))
+    world.add_item(2, 2, Item.get(ItemType.FOOD, "Apple", 20))
+    world.add_item(4, 4, Item.get(ItemType.WEAPON, "Sword", 5))
+    world.add_item(3, 4, Item.get(ItemType.RESOURCE, "Stone", 10))
 
     # Create agents
     researcher = Agent("AI Researcher")
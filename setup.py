@@ -11,8 +11,13 @@ setup(
     url='https://github.com/vjache/cw',
     packages=find_packages(),
     install_requires=[
+        'numpy',
+        'pygame-ce>=2.4',
         'pygame_gui'
     ],
+    extras_require={
+        'jit': ['numba']
+    },
     classifiers=[
         'Programming Language :: Python :: 3',
         'License :: OSI Approved :: MIT License',